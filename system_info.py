@@ -3,18 +3,40 @@
 Gather system information relevant for Snakemake profiling.
 """
 
+import asyncio
+import errno
+import fcntl
+import functools
+import glob
+import io
+import mmap
 import platform
 import os
+import re
+import shutil
 import subprocess
+import sys
+import tempfile
+import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# psutil reads /proc and sysctl directly, so with it most collectors need no
+# subprocesses; without it they fall back to files and system commands
+try:
+    import psutil
 
-def run_command(cmd):
-    """Run a shell command and return output."""
+    HAVE_PSUTIL = True
+except ImportError:
+    HAVE_PSUTIL = False
+
+
+def run_argv(argv):
+    """Run a command (without a shell) and return its output."""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        result = subprocess.run(argv, capture_output=True, text=True, check=False)
         if result.returncode == 0:
             return result.stdout.strip()
     except Exception:
@@ -22,40 +44,360 @@ def run_command(cmd):
     return None
 
 
+# Friendly names for common filesystem types
+FS_TYPE_NAMES = {
+    "apfs": "APFS (SSD)",
+    "hfs": "HFS+",
+    "ext4": "ext4 (likely SSD/HDD)",
+    "xfs": "XFS",
+    "btrfs": "Btrfs",
+    "nfs": "NFS (Network)",
+    "nfs4": "NFS (Network)",
+    "smbfs": "SMB (Network)",
+    "cifs": "SMB (Network)",
+    "smb3": "SMB (Network)",
+    "tmpfs": "tmpfs (RAM)",
+    "zfs": "ZFS",
+    "lustre": "Lustre (Network)",
+    "gpfs": "GPFS (Network)",
+    "beegfs": "BeeGFS (Network)",
+    "ceph": "CephFS (Network)",
+    "fuse.ceph": "CephFS (Network)",
+}
+# Network and parallel filesystems common on clusters
+NETWORK_FS_TYPES = {
+    "nfs",
+    "nfs4",
+    "smbfs",
+    "cifs",
+    "smb3",
+    "lustre",
+    "gpfs",
+    "beegfs",
+    "ceph",
+    "fuse.ceph",
+    "glusterfs",
+    "fuse.glusterfs",
+    "panfs",
+    "wekafs",
+    "afs",
+    "9p",
+    "sshfs",
+    "fuse.sshfs",
+    "webdav",
+}
+# Filesystems known to live on a local device (or in RAM)
+LOCAL_FS_TYPES = {
+    "apfs",
+    "hfs",
+    "ext2",
+    "ext3",
+    "ext4",
+    "xfs",
+    "btrfs",
+    "zfs",
+    "f2fs",
+    "tmpfs",
+}
+
+
+def find_mount(path, mounts):
+    """Return the value of the longest mount point in `mounts` containing path.
+
+    `mounts` is a sequence of (mount_point, value) pairs sorted longest first.
+    """
+    real_path = os.path.realpath(path)
+    return next(
+        (
+            value
+            for mount_point, value in mounts
+            if real_path == mount_point
+            or real_path.startswith(mount_point.rstrip("/") + "/")
+        ),
+        None,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_psutil_partitions():
+    """Return (mount_point, partition) pairs from psutil, longest first."""
+    parts = {p.mountpoint: p for p in psutil.disk_partitions(all=True)}
+    return sorted(parts.items(), key=lambda m: len(m[0]), reverse=True)
+
+
+# mount output line: /dev/disk3s1s1 on / (apfs, local, journaled)
+_MOUNT_RE = re.compile(r"^(.+?) on (.+) \(([^)]*)\)$")
+
+
+@functools.lru_cache(maxsize=1)
+def get_mount_entries():
+    """Return (device, mount_point, options) for each line of `mount` output.
+
+    `mount` is run and parsed only once per process.
+    """
+    output = run_argv(["mount"])
+    entries = []
+    for line in output.splitlines() if output else []:
+        m = _MOUNT_RE.match(line)
+        if m:
+            options = [p.strip() for p in m.group(3).split(",")]
+            entries.append((m.group(1), m.group(2), options))
+    return entries
+
+
+@functools.lru_cache(maxsize=1)
+def get_linux_mounts():
+    """Return (mount_point, fs_type) pairs from /proc/self/mountinfo, longest first."""
+    # Later entries stacked on the same mount point hide the earlier ones,
+    # so keep the last one for each
+    mounts = {}
+    try:
+        with open("/proc/self/mountinfo", "r") as f:
+            for line in f:
+                # 36 35 98:0 /mnt1 /mnt2 rw,noatime master:1 - ext3 /dev/root rw
+                fields = line.split()
+                sep = fields.index("-")
+                # Mount points escape whitespace as octal, e.g. \040 for a space
+                mount_point = re.sub(
+                    r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[4]
+                )
+                mounts[mount_point] = fields[sep + 1]
+    except Exception:
+        pass
+    return sorted(mounts.items(), key=lambda m: len(m[0]), reverse=True)
+
+
+# Platform facts never change during a run, so look each one up only once
+@functools.lru_cache(maxsize=1)
+def _system():
+    return platform.system()
+
+
+@functools.lru_cache(maxsize=1)
+def _release():
+    return platform.release()
+
+
+@functools.lru_cache(maxsize=1)
+def _python_version():
+    return platform.python_version()
+
+
+@functools.lru_cache(maxsize=1)
+def _machine():
+    return platform.machine()
+
+
+@functools.lru_cache(maxsize=1)
+def _processor():
+    return platform.processor()
+
+
+@functools.lru_cache(maxsize=1)
+def get_cpu_model():
+    """Return the CPU model/brand string, or None if it can't be determined."""
+    if _system() == "Darwin":
+        return run_argv(["sysctl", "-n", "machdep.cpu.brand_string"])
+
+    if _system() == "Linux":
+        return get_linux_cpuinfo().get("model name")
+
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_linux_cpuinfo():
+    """Return the first processor's fields from /proc/cpuinfo as a dict."""
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            text = f.read()
+    except Exception:
+        return {}
+
+    # Processors are separated by blank lines; the first one is representative
+    first = text.split("\n\n", 1)[0]
+    return {
+        k.strip(): v.strip()
+        for k, v in (line.split(":", 1) for line in first.splitlines() if ":" in line)
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def get_total_memory_bytes():
+    """Return total physical memory in bytes without psutil, or None."""
+    if _system() == "Darwin":
+        mem_size = run_argv(["sysctl", "-n", "hw.memsize"])
+        if mem_size:
+            return int(mem_size)
+    elif _system() == "Linux":
+        try:
+            with open("/proc/meminfo", "r") as f:
+                data = f.read()
+            # MemTotal:       16318412 kB
+            return int(data.split("MemTotal:", 1)[1].split(None, 1)[0]) * 1024
+        except Exception:
+            pass
+    return None
+
+
+def prime_linux_cpu_freqs():
+    """Read /proc/cpuinfo so the kernel samples every core's frequency at once.
+
+    The scaling_cur_freq reads that follow then don't each stall waiting
+    for a fresh sample. Deliberately uncached: the sample has to be recent.
+    """
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            f.read()
+    except OSError:
+        pass
+
+
+def get_linux_core_freqs_mhz():
+    """Return the current frequency of each core in MHz from cpufreq sysfs.
+
+    /proc/cpuinfo is read first (see prime_linux_cpu_freqs), and all files
+    are opened before any is read so the reads go back-to-back.
+    """
+    prime_linux_cpu_freqs()
+
+    paths = glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq")
+    fds = []
+    try:
+        for p in paths:
+            fds.append(os.open(p, os.O_RDONLY))
+        # Values are in kHz
+        return [int(os.read(fd, 32)) / 1000 for fd in fds]
+    except (OSError, ValueError):
+        return []
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _cpu_info_psutil():
+    """Get the CPU topology/frequency facts psutil can provide."""
+    info = {}
+    physical = psutil.cpu_count(logical=False)
+    if physical:
+        info["physical_cores"] = physical
+
+    if _system() == "Linux":
+        # psutil reads scaling_cur_freq per core too, so prime it the same way
+        prime_linux_cpu_freqs()
+    try:
+        per_cpu = psutil.cpu_freq(percpu=True) or []
+    except (AttributeError, NotImplementedError, OSError):
+        # Missing on some platforms; some releases fail on Apple Silicon
+        per_cpu = []
+    freqs = [f.current for f in per_cpu if f.current]
+    if freqs:
+        info["cpu_mhz_min"] = round(min(freqs), 1)
+        info["cpu_mhz_max"] = round(max(freqs), 1)
+    return info
+
+
 def get_cpu_info():
     """Get CPU information."""
     info = {
-        "processor": platform.processor() or "Unknown",
-        "architecture": platform.machine(),
+        "processor": _processor() or "Unknown",
+        "architecture": _machine(),
         "python_cpu_count": os.cpu_count(),
     }
+    if HAVE_PSUTIL:
+        info.update(_cpu_info_psutil())
 
     # macOS specific
-    if platform.system() == "Darwin":
+    if _system() == "Darwin":
+        # psutil has no brand string or P/E core split, so these still use sysctl
         # Get detailed CPU info
-        sysctl_info = run_command("sysctl -n machdep.cpu.brand_string")
-        if sysctl_info:
-            info["model"] = sysctl_info
+        model = get_cpu_model()
+        if model:
+            info["model"] = model
 
         # Get performance cores vs efficiency cores (Apple Silicon)
-        perf_cores = run_command("sysctl -n hw.perflevel0.physicalcpu")
-        eff_cores = run_command("sysctl -n hw.perflevel1.physicalcpu")
+        perf_cores = run_argv(["sysctl", "-n", "hw.perflevel0.physicalcpu"])
+        eff_cores = run_argv(["sysctl", "-n", "hw.perflevel1.physicalcpu"])
         if perf_cores and eff_cores:
             info["performance_cores"] = int(perf_cores)
             info["efficiency_cores"] = int(eff_cores)
 
     # Linux specific
-    elif platform.system() == "Linux":
+    elif _system() == "Linux":
         # Parse /proc/cpuinfo
+        cpuinfo = get_linux_cpuinfo()
+        model = get_cpu_model()
+        if model:
+            info["model"] = model
+
+        if not HAVE_PSUTIL:
+            freqs = get_linux_core_freqs_mhz()
+            if freqs:
+                info["cpu_mhz_min"] = round(min(freqs), 1)
+                info["cpu_mhz_max"] = round(max(freqs), 1)
+
+        flags = set(cpuinfo.get("flags", "").split())
+        info["flags_avx2"] = "avx2" in flags
+        info["flags_avx512"] = "avx512f" in flags
+        info["flags_sha_ni"] = "sha_ni" in flags
+
         try:
-            with open("/proc/cpuinfo", "r") as f:
-                for line in f:
-                    if line.startswith("model name"):
-                        info["model"] = line.split(":")[1].strip()
-                        break
-        except Exception:
+            if "cpu MHz" in cpuinfo:
+                info["cpu_mhz"] = float(cpuinfo["cpu MHz"])
+            if "cache size" in cpuinfo:
+                # e.g. "307200 KB"
+                info["l3_cache_kb"] = int(cpuinfo["cache size"].split()[0])
+            if "siblings" in cpuinfo:
+                info["siblings"] = int(cpuinfo["siblings"])
+            if "cpu cores" in cpuinfo:
+                info["cpu_cores"] = int(cpuinfo["cpu cores"])
+        except ValueError:
             pass
 
+        # os.cpu_count() counts SMT siblings and ignores affinity/cgroup limits
+        if not HAVE_PSUTIL:
+            siblings = set()
+            for p in glob.glob(
+                "/sys/devices/system/cpu/cpu[0-9]*/topology/thread_siblings_list"
+            ):
+                try:
+                    with open(p, "r") as f:
+                        siblings.add(f.read().strip())
+                except OSError:
+                    pass
+            if siblings:
+                info["physical_cores"] = len(siblings)
+
+        if hasattr(os, "sched_getaffinity"):
+            info["affinity_cpus"] = len(os.sched_getaffinity(0))
+
+        # cgroup v2 CPU quota of this process's own cgroup (e.g. a SLURM job),
+        # which /proc/self/cgroup lists as "0::<path>". A limit can be set on
+        # any ancestor, so walk up and keep the tightest one.
+        try:
+            with open("/proc/self/cgroup", "r") as f:
+                cgroup = next(
+                    line.strip()[3:] for line in f if line.startswith("0::")
+                )
+        except (OSError, StopIteration):
+            cgroup = None
+
+        if cgroup is not None:
+            quotas = []
+            path = Path("/sys/fs/cgroup", cgroup.lstrip("/"))
+            for d in [path, *path.parents]:
+                try:
+                    # "<quota> <period>" or "max <period>"
+                    quota, period = (d / "cpu.max").read_text().split()
+                    if quota != "max":
+                        quotas.append(int(quota) / int(period))
+                except (OSError, ValueError):
+                    pass
+                if d == Path("/sys/fs/cgroup"):
+                    break
+            if quotas:
+                info["cgroup_cpus"] = round(min(quotas), 2)
+
     return info
 
 
@@ -64,144 +406,437 @@ def get_memory_info():
     info = {}
 
     # Try using psutil if available
-    try:
-        import psutil
-
+    if HAVE_PSUTIL:
         mem = psutil.virtual_memory()
         info["total_gb"] = round(mem.total / (1024**3), 2)
         info["available_gb"] = round(mem.available / (1024**3), 2)
         info["used_percent"] = mem.percent
-    except ImportError:
+    else:
         # Fallback to system commands
-        if platform.system() == "Darwin":
-            mem_size = run_command("sysctl -n hw.memsize")
-            if mem_size:
-                info["total_gb"] = round(int(mem_size) / (1024**3), 2)
-        elif platform.system() == "Linux":
-            mem_info = run_command("grep MemTotal /proc/meminfo")
-            if mem_info:
-                kb = int(mem_info.split()[1])
-                info["total_gb"] = round(kb / (1024**2), 2)
+        total = get_total_memory_bytes()
+        if total:
+            info["total_gb"] = round(total / (1024**3), 2)
 
     return info
 
 
-def get_filesystem_info():
+def get_path_fs_info(path):
+    """Get filesystem type and disk usage for a single path."""
+    fs_info = {"path": str(path)}
+
+    # Get filesystem type
+    if HAVE_PSUTIL:
+        part = find_mount(path, get_psutil_partitions())
+        if part:
+            fs_info["type"] = FS_TYPE_NAMES.get(part.fstype, part.fstype)
+            # Only claim local/network when the mount actually tells us;
+            # psutil fills opts from the mount flags, which include "local"
+            # on macOS
+            if part.fstype in NETWORK_FS_TYPES:
+                fs_info["mount_type"] = "network"
+            elif part.fstype in LOCAL_FS_TYPES or "local" in part.opts.split(","):
+                fs_info["mount_type"] = "local"
+
+    elif _system() == "Darwin":
+        # Get mount point for the path
+        mount_result = run_argv(["df", str(path)])
+        if mount_result:
+            mount_point = mount_result.splitlines()[-1].split()[-1]
+
+            if mount_point:
+                # Get filesystem type from mount command
+                entries = get_mount_entries()
+                fs_parts = next(
+                    (opts for _, mp, opts in entries if mp == mount_point), None
+                )
+                if fs_parts is None:
+                    # df may report the device rather than the mount point
+                    fs_parts = next(
+                        (opts for dev, _, opts in entries if dev == mount_point), None
+                    )
+
+                if fs_parts is not None:
+                    fs_details = ", ".join(fs_parts).lower()
+
+                    # Determine filesystem type
+                    if "apfs" in fs_parts:
+                        fs_info["type"] = "APFS (SSD)"
+                    elif "hfs" in fs_parts:
+                        fs_info["type"] = "HFS+"
+                    elif "nfs" in fs_details:
+                        fs_info["type"] = "NFS (Network)"
+                    elif "smbfs" in fs_details:
+                        fs_info["type"] = "SMB (Network)"
+                    else:
+                        fs_info["type"] = fs_parts[0] if fs_parts else "Unknown"
+
+                    # Add mount attributes
+                    if "local" in fs_parts:
+                        fs_info["mount_type"] = "local"
+                    elif "nfs" in fs_details or "smbfs" in fs_details:
+                        fs_info["mount_type"] = "network"
+
+    elif _system() == "Linux":
+        # Look up the filesystem type of the longest mount point containing path
+        result = find_mount(path, get_linux_mounts())
+        if result:
+            fs_info["type"] = FS_TYPE_NAMES.get(result, result)
+            if result in NETWORK_FS_TYPES:
+                fs_info["mount_type"] = "network"
+            elif result in LOCAL_FS_TYPES:
+                fs_info["mount_type"] = "local"
+
+    # Get disk usage
+    try:
+        disk_usage = psutil.disk_usage if HAVE_PSUTIL else shutil.disk_usage
+        total, used, free = disk_usage(path)[:3]
+        fs_info["total_gb"] = round(total / (1024**3), 2)
+        fs_info["free_gb"] = round(free / (1024**3), 2)
+        # Same as df: root-reserved blocks count as neither used nor free
+        fs_info["used_percent"] = round(used / (used + free) * 100, 1)
+    except Exception:
+        pass
+
+    return fs_info
+
+
+async def get_filesystem_info():
     """Get filesystem information for current directory and common paths."""
-    info = {}
     paths_to_check = [
         ("current_dir", os.getcwd()),
         ("home", Path.home()),
         ("tmp", "/tmp"),
     ]
-
-    for name, path in paths_to_check:
-        if not os.path.exists(path):
-            continue
-
-        fs_info = {"path": str(path)}
-
-        # Get filesystem type
-        if platform.system() == "Darwin":
-            # Get mount point for the path
-            mount_result = run_command(f"df '{path}' | tail -1")
-            if mount_result:
-                mount_point = mount_result.split()[-1] if mount_result else None
-
-                if mount_point:
-                    # Get filesystem type from mount command
-                    mount_info = run_command(f"mount | grep '^{mount_point} '")
-                    if not mount_info:
-                        # Try without the caret for paths that might be symlinks
-                        mount_info = run_command(f"mount | grep ' {mount_point} '")
-
-                    if mount_info:
-                        # Parse mount output: /dev/disk3s1s1 on / (apfs, local, journaled)
-                        if "(" in mount_info:
-                            fs_details = mount_info.split("(")[1].split(")")[0]
-                            fs_parts = [p.strip() for p in fs_details.split(",")]
-
-                            # Determine filesystem type
-                            if "apfs" in fs_parts:
-                                fs_info["type"] = "APFS (SSD)"
-                            elif "hfs" in fs_parts:
-                                fs_info["type"] = "HFS+"
-                            elif "nfs" in fs_details.lower():
-                                fs_info["type"] = "NFS (Network)"
-                            elif "smbfs" in fs_details.lower():
-                                fs_info["type"] = "SMB (Network)"
-                            else:
-                                fs_info["type"] = fs_parts[0] if fs_parts else "Unknown"
-
-                            # Add mount attributes
-                            if "local" in fs_parts:
-                                fs_info["mount_type"] = "local"
-                            elif (
-                                "nfs" in fs_details.lower()
-                                or "smbfs" in fs_details.lower()
-                            ):
-                                fs_info["mount_type"] = "network"
-
-        elif platform.system() == "Linux":
-            # Use stat command to get filesystem type
-            result = run_command(f"stat -f -c %T '{path}'")
-            if result:
-                # Map common Linux filesystem types
-                fs_map = {
-                    "ext4": "ext4 (likely SSD/HDD)",
-                    "xfs": "XFS",
-                    "btrfs": "Btrfs",
-                    "nfs": "NFS (Network)",
-                    "tmpfs": "tmpfs (RAM)",
-                    "zfs": "ZFS",
-                }
-                fs_info["type"] = fs_map.get(result, result)
-
-        # Get disk usage
+    paths_to_check = [(name, p) for name, p in paths_to_check if os.path.exists(p)]
+
+    # Load the shared mount table once up front; lru_cache doesn't lock, so
+    # letting the worker threads below miss concurrently would load it per path
+    if HAVE_PSUTIL:
+        get_psutil_partitions()
+    elif _system() == "Darwin":
+        get_mount_entries()
+    elif _system() == "Linux":
+        get_linux_mounts()
+
+    # Each path needs its own round of external commands, so look them up in parallel
+    results = await asyncio.gather(
+        *(asyncio.to_thread(get_path_fs_info, path) for _, path in paths_to_check)
+    )
+    return {name: fs_info for (name, _), fs_info in zip(paths_to_check, results)}
+
+
+def open_test_file(flags=0):
+    """Open a nameless scratch file in the current directory and return its fd.
+
+    Uses O_TMPFILE where supported; otherwise creates a file and unlinks it
+    straight away. Either way the space is freed when the fd is closed, even
+    if the process is killed, so no benchmark file is ever left behind.
+    """
+    if hasattr(os, "O_TMPFILE"):
         try:
-            statvfs = os.statvfs(path)
-            total_gb = (statvfs.f_blocks * statvfs.f_frsize) / (1024**3)
-            free_gb = (statvfs.f_available * statvfs.f_frsize) / (1024**3)  # type: ignore
-            fs_info["total_gb"] = round(total_gb, 2)  # type: ignore
-            fs_info["free_gb"] = round(free_gb, 2)
-            fs_info["used_percent"] = round(((total_gb - free_gb) / total_gb) * 100, 1)
-        except Exception:
+            return os.open(".", os.O_RDWR | os.O_TMPFILE | flags, 0o600)
+        except OSError:
+            # Not supported by this kernel/filesystem (or rejects flags);
+            # fall back to a named file below
             pass
 
-        info[name] = fs_info
+    # Create the file with plain flags and unlink it before anything else can
+    # fail, so a rejected flag (e.g. O_DIRECT on ramfs) can't leave it behind
+    fd, name = tempfile.mkstemp(dir=".", prefix="io_test_", suffix=".bin")
+    os.unlink(name)
+    if not flags:
+        return fd
 
-    return info
+    if _system() == "Linux":
+        # The unlinked file can still be reopened with the extra flags
+        # through /proc; F_SETFL would silently drop O_DSYNC
+        try:
+            return os.open(f"/proc/self/fd/{fd}", os.O_RDWR | flags)
+        finally:
+            os.close(fd)
 
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | flags)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
 
-def get_io_performance():
-    """Get basic I/O performance metrics."""
-    info = {}
 
-    # Simple write/read test in current directory
-    test_file = "io_test_tmp.bin"
-    test_size = 100 * 1024 * 1024  # 100MB
+def get_io_uring_write_speed(block_size=1024 * 1024, batch=64):
+    """Measure batched write throughput using io_uring (Linux >= 5.6 only)."""
+    if _system() != "Linux":
+        return None
 
+    # io_uring write support landed in 5.6
     try:
-        # Write test
-        import time
+        kernel = tuple(int(x) for x in _release().split("-")[0].split(".")[:2])
+    except ValueError:
+        return None
+    if kernel < (5, 6):
+        return None
+
+    try:
+        import liburing
+    except ImportError:
+        return None
+
+    # Anonymous mmap gives a page-aligned buffer, as required by O_DIRECT
+    buf = mmap.mmap(-1, block_size, mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    fd = None
+    ring_ready = False
+    try:
+        buf.write(os.urandom(block_size))
+        try:
+            # Same flags and preallocation as the qd1/qd8 tests so the
+            # numbers are comparable
+            fd = open_test_file(os.O_DIRECT | os.O_DSYNC)
+            os.posix_fallocate(fd, 0, batch * block_size)
+            liburing.io_uring_queue_init(128, ring, 0)
+            ring_ready = True
+        except OSError as e:
+            # io_uring blocked (e.g. Docker's seccomp profile or
+            # kernel.io_uring_disabled) or O_DIRECT unsupported here
+            if e.errno in (errno.EPERM, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                return None
+            raise
+
+        start = time.time()
+        for i in range(batch):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, fd, buf, block_size, i * block_size)
+        liburing.io_uring_submit(ring)
+
+        for _ in range(batch):
+            liburing.io_uring_wait_cqe(ring, cqe)
+            res = cqe.res
+            liburing.io_uring_cqe_seen(ring, cqe)
+            if res < 0:
+                raise OSError(-res, os.strerror(-res))
+            if res != block_size:
+                raise OSError(errno.EIO, f"short io_uring write: {res} bytes")
+        os.fsync(fd)
+        write_time = time.time() - start
+    finally:
+        if ring_ready:
+            liburing.io_uring_queue_exit(ring)
+        if fd is not None:
+            os.close(fd)
+        buf.close()
+
+    return round(batch * block_size / (1024 * 1024) / write_time, 2)
 
+
+def time_write_direct(fd, buf, test_size):
+    """Write test_size bytes to fd and return the elapsed time in seconds.
+
+    fd must be opened with O_DIRECT|O_DSYNC (Linux only). The file is
+    preallocated first so block allocation isn't timed, and each write
+    bypasses the page cache and is durable on return. Raises OSError
+    (EINVAL/EOPNOTSUPP) if the filesystem doesn't support it.
+    """
+    # O_DIRECT needs an aligned buffer; anonymous mmap is page-aligned
+    aligned = mmap.mmap(-1, len(buf), mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    aligned.write(buf)
+
+    try:
+        os.posix_fallocate(fd, 0, test_size)
         start = time.time()
-        with open(test_file, "wb") as f:
-            f.write(os.urandom(test_size))
+        for _ in range(test_size // len(buf)):
+            os.write(fd, aligned)
+        return time.time() - start
+    finally:
+        aligned.close()
+
+
+def time_write_buffered(fd, buf, test_size):
+    """Write fd through the page cache, fsync it, and return the elapsed time.
+
+    On macOS F_NOCACHE is set for the duration of the write. There is no
+    way to evict a file from the unified buffer cache afterwards, so this
+    is what keeps the following uncached read honest.
+    """
+    no_cache = _system() == "Darwin"
+    if no_cache:
+        fcntl.fcntl(fd, fcntl.F_NOCACHE, 1)
+    try:
+        start = time.time()
+        with open(fd, "wb", closefd=False) as f:
+            for _ in range(test_size // len(buf)):
+                f.write(buf)
             f.flush()
             os.fsync(f.fileno())
-        write_time = time.time() - start
-        info["write_speed_mb_s"] = round(test_size / (1024 * 1024) / write_time, 2)
+        return time.time() - start
+    finally:
+        # The read side dups fd and shares the flag, and the cached read
+        # needs the first read to fill the cache
+        if no_cache:
+            fcntl.fcntl(fd, fcntl.F_NOCACHE, 0)
+
+
+def time_write_parallel(fd, buf, test_size, threads=8, direct=False):
+    """Write fd from several threads at once and return the elapsed time.
+
+    The file is split into `threads` contiguous ranges, each written with
+    pwrite by its own thread, so the device sees that many requests in
+    flight. With direct, fd must be opened with O_DIRECT|O_DSYNC as in
+    time_write_direct and an aligned copy of buf is used.
+    """
+    block_size = len(buf)
+    n_blocks = test_size // block_size
+    threads = max(1, min(threads, n_blocks))
+    # Contiguous, non-overlapping [first, last) block ranges, one per thread
+    bounds = [n_blocks * i // threads for i in range(threads + 1)]
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+
+    if direct:
+        aligned = mmap.mmap(-1, block_size, mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+        aligned.write(buf)
+        buf = aligned
+
+    def write_range(first, last):
+        for block in range(first, last):
+            os.pwrite(fd, buf, block * block_size)
 
-        # Read test
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, test_size)
+        start = time.time()
+        with ThreadPoolExecutor(threads) as ex:
+            list(ex.map(lambda r: write_range(*r), ranges))
+        os.fsync(fd)
+        return time.time() - start
+    finally:
+        if direct:
+            buf.close()
+
+
+def time_read(fd, block_size, drop_cache=False):
+    """Read the file behind fd from the start and return the elapsed time in seconds.
+
+    With drop_cache, the file is evicted from the page cache first (Linux).
+    macOS can't evict it, so there time_write_buffered keeps the written
+    data out of the cache instead.
+    """
+    if _system() == "Linux":
+        # Reopen read-only so flags like O_DIRECT on fd don't apply to the read
+        read_fd = os.open(f"/proc/self/fd/{fd}", os.O_RDONLY)
+    else:
+        read_fd = os.dup(fd)
+        os.lseek(read_fd, 0, os.SEEK_SET)
+
+    with open(read_fd, "rb", buffering=0) as f:
+        if drop_cache and hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+        if _system() == "Linux":
+            # Have the kernel splice the file straight into /dev/null so the
+            # data never has to pass through Python
+            sink = os.open(os.devnull, os.O_WRONLY)
+            try:
+                start = time.time()
+                while os.sendfile(sink, f.fileno(), None, 1 << 30):
+                    pass
+                return time.time() - start
+            finally:
+                os.close(sink)
+
+        read_buf = bytearray(block_size)
         start = time.time()
-        with open(test_file, "rb") as f:
-            _ = f.read()
-        read_time = time.time() - start
-        info["read_speed_mb_s"] = round(test_size / (1024 * 1024) / read_time, 2)
+        while f.readinto(read_buf):
+            pass
+        return time.time() - start
+
+
+def get_io_performance(fs_info=None):
+    """Get basic I/O performance metrics.
+
+    fs_info is the get_filesystem_info() record for the current directory;
+    it's used to shrink the test on network filesystems and skip it when
+    the disk is nearly full.
+    """
+    info = {}
+    fs_info = fs_info or {}
+
+    # Simple write/read test in current directory
+    block_size = 1024 * 1024  # 1MB
+    test_size = 100 * block_size  # 100MB
+
+    if fs_info.get("free_gb", float("inf")) < 1:
+        info["skipped"] = "low_space"
+        return info
 
-        # Cleanup
-        os.remove(test_file)
+    fs_type = fs_info.get("type", "").lower()
+    if fs_info.get("mount_type") == "network" or fs_type.startswith(
+        ("nfs", "smb", "cifs")
+    ):
+        # 100MB over the network can take minutes; a small sample is enough
+        test_size = 4 * block_size
+        info["note"] = "network_fs_small_sample"
+
+    try:
+        # Random (not zero) data so sparse/compressing filesystems still
+        # write every block; one 1MB buffer is reused for the whole file.
+        buf = os.urandom(block_size)
+
+        # Write test (one write in flight at a time)
+        fd = None
+        if hasattr(os, "O_DIRECT"):
+            try:
+                fd = open_test_file(os.O_DIRECT | os.O_DSYNC)
+                write_time = time_write_direct(fd, buf, test_size)
+                info["write_mode"] = "direct"
+            except OSError as e:
+                # e.g. tmpfs rejects O_DIRECT; use the buffered path instead
+                if fd is not None:
+                    os.close(fd)
+                    fd = None
+                if e.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+        if fd is None:
+            fd = open_test_file()
+            write_time = time_write_buffered(fd, buf, test_size)
+            info["write_mode"] = "buffered"
+
+        # The test file has no name, so closing fd is all the cleanup it needs
+        try:
+            info["write_speed_qd1_mb_s"] = round(
+                test_size / (1024 * 1024) / write_time, 2
+            )
+
+            # Read test, first with the file evicted so the device is actually
+            # hit, then again straight from the page cache that read just filled
+            read_time = time_read(fd, block_size, drop_cache=True)
+            info["read_speed_uncached_mb_s"] = round(
+                test_size / (1024 * 1024) / read_time, 2
+            )
+            read_time = time_read(fd, block_size)
+            info["read_speed_cached_mb_s"] = round(
+                test_size / (1024 * 1024) / read_time, 2
+            )
+        finally:
+            os.close(fd)
+
+        # Parallel write test (8 writes in flight at once)
+        direct = info["write_mode"] == "direct"
+        # Same flags as the single-stream test so only the queue depth differs
+        fd = open_test_file(os.O_DIRECT | os.O_DSYNC if direct else 0)
+        try:
+            write_time = time_write_parallel(fd, buf, test_size, direct=direct)
+        finally:
+            os.close(fd)
+        info["write_speed_qd8_mb_s"] = round(
+            test_size / (1024 * 1024) / write_time, 2
+        )
+
+        # Batched write test (many requests in flight at once)
+        uring_speed = get_io_uring_write_speed(
+            block_size, batch=min(64, test_size // block_size)
+        )
+        if uring_speed is not None:
+            info["write_speed_uring_mb_s"] = uring_speed
 
     except Exception as e:
         info["error"] = str(e)
@@ -209,54 +844,71 @@ def get_io_performance():
     return info
 
 
-def main():
+async def main():
     """Gather and display system information."""
-    print("=" * 60)
-    print("System Information for Snakemake Profiling")
-    print("=" * 60)
-    print(f"Timestamp: {datetime.now().isoformat()}")
-    print(f"Platform: {platform.system()} {platform.release()}")
-    print(f"Python: {platform.python_version()}")
-    print()
+    # One timestamp for the header, the JSON and the filename so they all agree
+    now = datetime.now()
+    ts_iso = now.isoformat()
+    ts_file = now.strftime("%Y%m%d_%H%M%S")
+
+    out = io.StringIO()
+    print("=" * 60, file=out)
+    print("System Information for Snakemake Profiling", file=out)
+    print("=" * 60, file=out)
+    print(f"Timestamp: {ts_iso}", file=out)
+    print(f"Platform: {_system()} {_release()}", file=out)
+    print(f"Python: {_python_version()}", file=out)
+    print(file=out)
+    # Show the header right away; the collectors below can take a while
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+    out = io.StringIO()
+
+    # The collectors are independent and mostly wait on subprocesses or disk,
+    # so run them concurrently
+    cpu_info, mem_info, fs_info = await asyncio.gather(
+        asyncio.to_thread(get_cpu_info),
+        asyncio.to_thread(get_memory_info),
+        get_filesystem_info(),
+    )
+
+    # The I/O test is sized from the filesystem it runs on, so it goes last
+    io_info = await asyncio.to_thread(get_io_performance, fs_info.get("current_dir"))
 
     # CPU Information
-    print("CPU Information:")
-    cpu_info = get_cpu_info()
+    print("CPU Information:", file=out)
     for key, value in cpu_info.items():
-        print(f"  {key}: {value}")
-    print()
+        print(f"  {key}: {value}", file=out)
+    print(file=out)
 
     # Memory Information
-    print("Memory Information:")
-    mem_info = get_memory_info()
+    print("Memory Information:", file=out)
     for key, value in mem_info.items():
-        print(f"  {key}: {value}")
-    print()
+        print(f"  {key}: {value}", file=out)
+    print(file=out)
 
     # Filesystem Information
-    print("Filesystem Information:")
-    fs_info = get_filesystem_info()
+    print("Filesystem Information:", file=out)
     for name, details in fs_info.items():
-        print(f"  {name}:")
+        print(f"  {name}:", file=out)
         for key, value in details.items():
-            print(f"    {key}: {value}")
-    print()
+            print(f"    {key}: {value}", file=out)
+    print(file=out)
 
     # I/O Performance
-    print("I/O Performance (current directory):")
-    io_info = get_io_performance()
+    print("I/O Performance (current directory):", file=out)
     for key, value in io_info.items():
-        print(f"  {key}: {value}")
-    print()
+        print(f"  {key}: {value}", file=out)
+    print(file=out)
 
     # Save to JSON
-    output_file = f"system_info_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output_file = f"system_info_{ts_file}.json"
     all_info = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": ts_iso,
         "platform": {
-            "system": platform.system(),
-            "release": platform.release(),
-            "python": platform.python_version(),
+            "system": _system(),
+            "release": _release(),
+            "python": _python_version(),
         },
         "cpu": cpu_info,
         "memory": mem_info,
@@ -264,12 +916,28 @@ def main():
         "io_performance": io_info,
     }
 
-    with open(output_file, "w") as f:
-        json.dump(all_info, f, indent=2)
+    try:
+        import orjson
+
+        payload = orjson.dumps(all_info, option=orjson.OPT_INDENT_2)
+    except ImportError:
+        payload = json.dumps(all_info, indent=2).encode()
+
+    # Write to a temporary file and rename it into place so an interrupted
+    # run never leaves a truncated report behind
+    tmp_file = output_file + ".tmp"
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_file, output_file)
 
-    print(f"Results saved to: {output_file}")
-    print("=" * 60)
+    print(f"Results saved to: {output_file}", file=out)
+    print("=" * 60, file=out)
+    sys.stdout.write(out.getvalue())
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())